@@ -1,4 +1,6 @@
 import argparse
+import functools
+import inspect
 import numbers
 
 import numpy as np
@@ -31,24 +33,28 @@ def check_random_state(seed):
                      " instance" % seed)
 
 
-def init_xavier(fan, constant=1):
-    """Xavier initialization of network weights."""
-    fan_in, fan_out = fan[0], fan[1]
-    low = -constant * np.sqrt(6.0 / (fan_in + fan_out))
-    high = constant * np.sqrt(6.0 / (fan_in + fan_out))
-    return tf.random_uniform((fan_in, fan_out),
-                             minval=low, maxval=high,
-                             dtype=tf.float32)
-
+def init_xavier(fan, constant=1, rng=None):
+    """Xavier initialization of network weights.
 
-def binary_crossentropy(output, target, offset=1e-10):
-    """Compute the binary cross-entropy per sample.
+    Parameters
+    ----------
+    fan : list
+        Number of inputs and outputs of the layer.
+    constant : float
+        Scale of the initialization range.
+    rng : None or int or instance of RandomState
+        Random number generator (see `check_random_state`).
 
-    Add offset to avoid evaluation of log(0.0).
+    Returns
+    -------
+    ndarray, shape (fan_in, fan_out)
+        Initial weights.
     """
-    output_ = tf.clip_by_value(output, offset, 1 - offset)
-    return -tf.reduce_sum(target * tf.log(output_)
-                          + (1 - target) * tf.log(1 - output_), 1)
+    rng = check_random_state(rng)
+    fan_in, fan_out = fan[0], fan[1]
+    low = -constant * np.sqrt(6.0 / (fan_in + fan_out))
+    high = constant * np.sqrt(6.0 / (fan_in + fan_out))
+    return rng.uniform(low, high, (fan_in, fan_out)).astype(np.float32)
 
 
 def binomial(shape=[1], p=0.5, dtype='float32'):
@@ -67,9 +73,7 @@ def binomial(shape=[1], p=0.5, dtype='float32'):
         Binomial distribution.
     """
     dist = tf.random_uniform(shape=shape, minval=0, maxval=1, dtype='float32')
-    return tf.where(tf.less(dist, tf.fill(shape, p)),
-                    tf.ones(shape, dtype=dtype),
-                    tf.zeros(shape, dtype=dtype))
+    return tf.cast(tf.less(dist, p), dtype)
 
 
 def binomial_vec(p_vec, shape=[1], dtype='float32'):
@@ -88,9 +92,7 @@ def binomial_vec(p_vec, shape=[1], dtype='float32'):
         Binomial distribution.
     """
     dist = tf.random_uniform(shape=shape, minval=0, maxval=1, dtype='float32')
-    return tf.where(tf.less(dist, p_vec),
-                    tf.ones(shape, dtype=dtype),
-                    tf.zeros(shape, dtype=dtype))
+    return tf.cast(tf.less(dist, p_vec), dtype)
 
 
 def salt_and_pepper_noise(X, rate=0.3):
@@ -110,11 +112,12 @@ def salt_and_pepper_noise(X, rate=0.3):
     x_corrupted : Tensor
         Input tensor with `rate` fraction of values corrupted.
     """
-    a = binomial(shape=tf.shape(X), p=1 - rate)
-    b = binomial(shape=tf.shape(X), p=0.5)
-    z = tf.zeros(tf.shape(X), dtype='float32')
-    c = tf.where(tf.equal(a, z), b, z)
-    return tf.add(tf.multiply(X, a), c)
+    # A single draw decides both whether an element is corrupted (dist <
+    # rate) and, if so, whether it is set to one (dist < rate / 2) or zero.
+    dist = tf.random_uniform(shape=tf.shape(X), minval=0, maxval=1,
+                             dtype='float32')
+    salt = tf.cast(tf.less(dist, 0.5 * rate), X.dtype)
+    return tf.where(tf.less(dist, rate), salt, X)
 
 
 def masking_noise(X, rate=0.3):
@@ -191,9 +194,16 @@ class DAE(object):
     transfer_fct : object
         Transfer function for hidden layers.
     W_init_fct : object
-        Initialization function for weights.
+        Initializer for weights. Either a TensorFlow initializer (e.g.,
+        `tf.glorot_uniform_initializer()`), seeded by `random_state` through
+        the graph seed, or a function of a shape (e.g., `init_xavier`). A
+        function of a shape is seeded by `random_state` only if it takes an
+        `rng` keyword (left unset or None), as `init_xavier` and partials of
+        it do; otherwise it draws from its own random state.
     b_init_fct : object
-        Initialization function for biases.
+        Initializer for biases. Either a TensorFlow initializer (e.g.,
+        `tf.zeros_initializer()`) or a function of a shape (e.g.,
+        `tf.zeros`), seeded as for `W_init_fct`.
     learning_rate : float
         Learning rate schedule for weight updates.
     random_state : int or None, optional (default=None)
@@ -202,6 +212,10 @@ class DAE(object):
         by np.random.
     log_every : int
         Print loss after this many steps.
+    mixed_precision : bool, optional (default=False)
+        If True, compute the layer matmuls in half precision (keeping the
+        weights, biases and loss in single precision) and train with a
+        scaled loss.
 
     References
     ----------
@@ -234,8 +248,10 @@ class DAE(object):
     def __init__(self, num_epochs, batch_size, hidden_dim, n_input,
                  corrupt_type='salt_and_pepper', corrupt_prob=0.5,
                  corrupt_std=0.25, walkbacks=0, transfer_fct=tf.nn.sigmoid,
-                 W_init_fct=init_xavier, b_init_fct=tf.zeros,
-                 learning_rate=0.001, random_state=None, log_every=None):
+                 W_init_fct=tf.glorot_uniform_initializer(),
+                 b_init_fct=tf.zeros_initializer(),
+                 learning_rate=0.001, random_state=None, log_every=None,
+                 mixed_precision=False):
         self.num_epochs = num_epochs
         self.batch_size = batch_size
 
@@ -259,150 +275,369 @@ class DAE(object):
         tf.set_random_seed(random_state)
 
         self.log_every = log_every
+        self.mixed_precision = mixed_precision
 
         # TensorFlow graph input.
-        self.x = tf.placeholder(tf.float32, [None, self.net_arch['n_input']])
+        self.x = tf.placeholder(tf.float32, [None, self.net_arch['n_input']],
+                                name='x')
+        # Training data input pipeline.
+        self._create_input_pipeline()
 
         # Create autoencoder network.
         self._create_network()
         # Define the loss function.
         self._create_loss_optimizer()
+        # Define a full training epoch.
+        self._create_epoch_op()
 
         # Initialize the TensorFlow variables.
         init = tf.global_variables_initializer()
 
-        # Launch the session.
-        self.sess = tf.InteractiveSession()
+        # Launch the session with XLA JIT compilation enabled.
+        config = tf.ConfigProto()
+        config.graph_options.optimizer_options.global_jit_level = \
+            tf.OptimizerOptions.ON_1
+        self.sess = tf.Session(config=config)
         self.sess.run(init)
         self.saver = tf.train.Saver(tf.global_variables())
 
+    def _create_input_pipeline(self):
+        """Create a `tf.data` pipeline that feeds minibatches to the network.
+
+        The pipeline shuffles, batches and prefetches sample indices, so
+        that batch preparation overlaps with training steps. The training
+        data is loaded once per call to `fit` into a (non-trainable) variable
+        and stays on the device across epochs; each minibatch is gathered
+        from it by index.
+        """
+        n_input = self.net_arch['n_input']
+
+        self._X_train = tf.placeholder(tf.float32, [None, n_input])
+        self._X_var = tf.Variable(self._X_train, trainable=False,
+                                  validate_shape=False, collections=[])
+        X_train = tf.reshape(self._X_var, [-1, n_input])
+        n_train = tf.shape(X_train, out_type=tf.int64)[0]
+
+        def batch(dataset):
+            return dataset.batch(self.batch_size, drop_remainder=True) \
+                .prefetch(tf.data.experimental.AUTOTUNE)
+
+        dataset = tf.data.Dataset.range(n_train)
+        # Minibatches all have exactly `batch_size` samples, so the training
+        # graph is specialized to that (static) shape.
+        iterator = tf.data.Iterator.from_structure(
+            tf.int64, tf.TensorShape([self.batch_size]))
+
+        # Shuffle by drawing a fresh permutation of the indices every time
+        # the iterator is initialized, i.e. once per epoch.
+        permutation = tf.data.Dataset.from_tensor_slices(
+            tf.random_shuffle(tf.range(n_train)))
+
+        self._init_ordered = iterator.make_initializer(batch(dataset))
+        self._init_shuffled = iterator.make_initializer(batch(permutation))
+        self._iterator = iterator
+        self._train_data = X_train
+        self._n_batches = n_train // self.batch_size
+
     def _create_network(self):
         """Create a denoising autoencoder network."""
         layer_dim = np.append(np.array(self.net_arch['n_input']),
                               self.net_arch['hidden_dim'])
 
-        self.z, self.y, self.p_X_chain = self._autoencoder(self.x, layer_dim)
+        self._weights = self._build_weights(layer_dim)
+        z, self.logits_chain = self._autoencoder(self.x, self._weights)
+        # Name the outputs, so they can be fetched from a frozen graph. The
+        # output layer is sigmoidal, as it parameterizes a Bernoulli
+        # distribution.
+        self.z = tf.identity(z, name='z')
+        self.y = tf.nn.sigmoid(self.logits_chain[-1], name='y')
+        self._build_sample_chain(self._weights)
 
-    def _autoencoder(self, layer_input, layer_dim):
-        """Build a deep denoising autoencoder with tied weights. Implements
-        walkback training (optional).
+    def _build_weights(self, layer_dim):
+        """Create the weights and biases of the autoencoder.
+
+        The weights are tied between the encoder and the decoder, and are
+        shared by every walkback step and by the sampling chain.
 
         Parameters
         ----------
         layer_dim : list
             Number of neurons for each layer of the autoencoder.
 
+        Returns
+        -------
+        Ws : list
+            Encoder weights (transposed for the decoder).
+        b_enc : list
+            Encoder biases.
+        b_dec : list
+            Decoder biases.
+        """
+        W_init = self._initializer(self.W_init_fct)
+        b_init = self._initializer(self.b_init_fct)
+
+        Ws, b_enc, b_dec = [], [], []
+        with tf.variable_scope(None, default_name='dae'):
+            for i, (n_input, n_output) in enumerate(
+                    zip(layer_dim[:-1], layer_dim[1:])):
+                Ws.append(tf.get_variable(
+                    'W_%d' % i, shape=[int(n_input), int(n_output)],
+                    dtype=tf.float32, initializer=W_init))
+                b_enc.append(tf.get_variable(
+                    'b_enc_%d' % i, shape=[int(n_output)],
+                    dtype=tf.float32, initializer=b_init))
+            for i, n_output in enumerate(layer_dim[:-1][::-1]):
+                b_dec.append(tf.get_variable(
+                    'b_dec_%d' % i, shape=[int(n_output)],
+                    dtype=tf.float32, initializer=b_init))
+
+        return (Ws, b_enc, b_dec)
+
+    def _initializer(self, init_fct):
+        """Wrap an initialization function for use with `tf.get_variable`.
+
+        TensorFlow initializers are returned as they are. Any other function
+        is called with the shape of the variable only (as `init_xavier` or
+        `tf.zeros`), and its result cast to the variable dtype. If it takes
+        an `rng` keyword that is not already set, it is bound to
+        `self.random_state`.
+
+        Parameters
+        ----------
+        init_fct : object
+            Initializer or function of a shape.
+
+        Returns
+        -------
+        initializer : object
+            Initializer accepted by `tf.get_variable`.
+        """
+        if isinstance(init_fct, tf.keras.initializers.Initializer):
+            return init_fct
+        try:
+            rng_param = inspect.signature(init_fct).parameters.get('rng')
+        except (TypeError, ValueError):
+            rng_param = None
+        if rng_param is not None and rng_param.default is None:
+            # Draw the initial values from the model's random state, so that
+            # they are reproducible given `random_state`.
+            init_fct = functools.partial(init_fct, rng=self.random_state)
+
+        def initializer(shape, dtype=tf.float32, partition_info=None):
+            return tf.cast(init_fct(shape), dtype)
+
+        return initializer
+
+    def _corrupt_input(self, x):
+        """Corrupt data according to the corruption type.
+
+        Parameters
+        ----------
+        x : Tensor
+            Input to the network.
+
+        Returns
+        -------
+        Corrupted data, x_corrupted.
+        """
+        if self.corrupt_type == 'salt_and_pepper':
+            x_corrupted = salt_and_pepper_noise(x, self.corrupt_prob)
+        elif self.corrupt_type == 'masking':
+            x_corrupted = masking_noise(x, self.corrupt_prob)
+        elif self.corrupt_type == 'gaussian':
+            # Equivalent to mixing x and gaussian_noise(x, std) with weights
+            # (1 - corrupt_prob) and corrupt_prob, in a single addition.
+            x_corrupted = gaussian_noise(
+                x, std=self.corrupt_prob * self.corrupt_std)
+        else:
+            x_corrupted = salt_and_pepper_noise(x, self.corrupt_prob)
+        return x_corrupted
+
+    def _forward(self, x, Ws, b_enc, b_dec):
+        """Pass data through the encoder and the (tied) decoder.
+
+        Parameters
+        ----------
+        x : Tensor
+            Input to the network.
+        Ws : list
+            Encoder weights (transposed for the decoder).
+        b_enc : list
+            Encoder biases.
+        b_dec : list
+            Decoder biases.
+
         Returns
         -------
         z : Tensor
             Inner-most latent representation.
-        y : Tensor
-            Output reconstruction of the input.
-        p_X_chain : array
-            Walkback training chain.
+        logits : Tensor
+            Output logits (pre-sigmoid reconstruction) of the input.
         """
-        def corrupt_input(x, corrupt_prob, corrupt_std):
-            """Corrupt data according to the corruption type.
-
-            Parameters
-            ----------
-            x : Tensor
-                Input placeholder to the network.
-            corrupt_prob : float
-                Probability of generating corrupted values.
-            corrupt_std : float
-                Standard deviation of corrupted values (Gaussian).
-
-            Returns
-            -------
-            Corrupted data, x_corrupted.
-            """
-            if self.corrupt_type == 'salt_and_pepper':
-                x_corrupted = salt_and_pepper_noise(x, corrupt_prob)
-            elif self.corrupt_type == 'masking':
-                x_corrupted = masking_noise(x, corrupt_prob)
-            elif self.corrupt_type == 'gaussian':
-                x_corrupted = gaussian_noise(x, std=corrupt_std) \
-                    * corrupt_prob + x * (1 - corrupt_prob)
-            else:
-                x_corrupted = salt_and_pepper_noise(x, corrupt_prob)
-            return x_corrupted
-
-        def update_layers(x):
-            """Perform layer updates.
-
-            Parameters
-            ----------
-            x : Tensor
-                Input placeholder to the network.
-
-            Returns
-            -------
-            x : Tensor
-                Input placeholder to the network.
-            z : Tensor
-                Inner-most latent representation.
-            y : Tensor
-                Output reconstruction of the input.
-            """
-            layer_input = corrupt_input(x, self.corrupt_prob, self.corrupt_std)
-
-            # Build the encoder.
-            encoder = []
-            for layer_i, n_output in enumerate(layer_dim[1:]):
-                n_input = int(layer_input.get_shape()[1])
-                W = tf.Variable(self.W_init_fct(
-                    [n_input, n_output]), dtype=tf.float32)
-                b = tf.Variable(self.b_init_fct([n_output]), dtype=tf.float32)
-                encoder.append(W)
+        layer_input = x
+
+        # Mark the layers for XLA compilation, so that the matmul/bias/
+        # transfer chains get fused.
+        with tf.contrib.compiler.jit.experimental_jit_scope():
+            # Apply the encoder.
+            for W, b in zip(Ws, b_enc):
                 output = self.transfer_fct(
-                    tf.add(tf.matmul(layer_input, W), b))
+                    tf.add(self._matmul(layer_input, W), b))
                 layer_input = output
 
             # Latent representation.
             z = layer_input
 
-            encoder.reverse()
-            # Build the decoder using the same weights.
-            for layer_i, n_output in enumerate(layer_dim[:-1][::-1]):
-                n_input = int(layer_input.get_shape()[1])
-                W = tf.transpose(encoder[layer_i])
-                b = tf.Variable(self.b_init_fct([n_output]), dtype=tf.float32)
-                output = self.transfer_fct(
-                    tf.add(tf.matmul(layer_input, W), b))
-                layer_input = output
+            # Apply the decoder using the same weights.
+            for layer_i, (W, b) in enumerate(zip(Ws[::-1], b_dec)):
+                logits = tf.add(
+                    self._matmul(layer_input, W, transpose_b=True), b)
+                if layer_i < len(b_dec) - 1:
+                    layer_input = self.transfer_fct(logits)
 
-            # Reconstruction through the network.
-            y = layer_input
+        return (z, logits)
 
-            return (x, y, z)
+    def _matmul(self, a, b, transpose_b=False):
+        """Multiply two matrices, in half precision if `mixed_precision` is
+        set. The product is always returned in single precision.
+        """
+        if self.mixed_precision:
+            return tf.cast(tf.matmul(tf.cast(a, tf.float16),
+                                     tf.cast(b, tf.float16),
+                                     transpose_b=transpose_b), tf.float32)
+        return tf.matmul(a, b, transpose_b=transpose_b)
 
-        # Define p(X|...).
-        p_X_chain = []
-        # Perform layer updates.
-        if self.walkbacks > 0:
-            x = layer_input
-            for i in range(self.walkbacks):
-                x, y, z = update_layers(x)
-                p_X_chain.append(y)
+    def _autoencoder(self, layer_input, weights):
+        """Build a deep denoising autoencoder with tied weights. Implements
+        walkback training (optional).
+
+        Parameters
+        ----------
+        layer_input : Tensor
+            Input to the network.
+        weights : tuple
+            Weights and biases of the network, see `_build_weights`.
+
+        Returns
+        -------
+        z : Tensor
+            Inner-most latent representation.
+        logits_chain : list
+            Output logits for each step of the walkback training chain.
+        """
+        # Define the logits of p(X|...).
+        logits_chain = []
+        # Perform layer updates; without walkbacks the chain has one step.
+        x = layer_input
+        n_steps = max(self.walkbacks, 1)
+        for i in range(n_steps):
+            z, logits = self._forward(self._corrupt_input(x), *weights)
+            logits_chain.append(logits)
+            if i < n_steps - 1:
+                y = tf.nn.sigmoid(logits)
                 x = binomial_vec(y, shape=tf.shape(y))  # sample from p(X|...)
-        else:
-            x, y, z = update_layers(layer_input)
 
-        return (z, y, p_X_chain)
+        return (z, logits_chain)
+
+    def _build_sample_chain(self, weights):
+        """Build the pseudo-Gibbs sampling chain as a single graph op.
+
+        Each step of the chain is the same computation as `self.y`, i.e. a
+        full pass through the walkback chain (if any).
+
+        Parameters
+        ----------
+        weights : tuple
+            Weights and biases of the network, see `_build_weights`.
+        """
+        self.n_samples_ph = tf.placeholder(tf.int32, [])
+
+        def cond(i, x, samples):
+            return tf.less(i, self.n_samples_ph)
+
+        def body(i, x, samples):
+            z, logits_chain = self._autoencoder(x, weights)
+            y = tf.nn.sigmoid(logits_chain[-1])
+            return (i + 1, y, samples.write(i, y))
+
+        samples = tf.TensorArray(tf.float32, size=self.n_samples_ph)
+        _, _, samples = tf.while_loop(
+            cond, body, (tf.constant(0), self.x, samples))
+        self.samples = samples.stack()
+
+    def _loss(self, x, logits_chain):
+        """Compute the mean binary cross-entropy of the reconstructions.
+
+        Parameters
+        ----------
+        x : Tensor
+            Input to the network.
+        logits_chain : list
+            Output logits for each step of the walkback training chain.
+
+        Returns
+        -------
+        Tensor
+            Cost of the input.
+        """
+        # Mark the loss for XLA compilation, so that the reduction gets
+        # fused with the cross-entropy.
+        with tf.contrib.compiler.jit.experimental_jit_scope():
+            # Stack the chain to shape (walkbacks, batch_size, n_input), so
+            # the loss is computed in a single reduction.
+            logits = tf.stack(logits_chain, axis=0)
+            labels = tf.broadcast_to(x, tf.shape(logits))
+            cross_entropy = tf.nn.sigmoid_cross_entropy_with_logits(
+                labels=labels, logits=logits)
+            # Binary cross-entropy per sample, summed over the walkback
+            # chain.
+            return tf.reduce_mean(tf.reduce_sum(cross_entropy, axis=[0, 2]))
 
     def _create_loss_optimizer(self):
         """Define the cost function."""
-        if self.walkbacks > 0:
-            cross_entropies = \
-                [binary_crossentropy(y, self.x) for y in self.p_X_chain]
-            self.cost = tf.reduce_mean(tf.add_n(cross_entropies))
-        else:
-            self.cost = tf.reduce_mean(binary_crossentropy(self.y, self.x))
+        self.cost = self._loss(self.x, self.logits_chain)
 
         # Use ADAM optimizer.
-        opt = tf.train.AdamOptimizer(learning_rate=self.learning_rate)
-        self.opt = opt.minimize(self.cost)
+        Ws, b_enc, b_dec = self._weights
+        self._var_list = Ws + b_enc + b_dec
+        self._optimizer = tf.train.AdamOptimizer(
+            learning_rate=self.learning_rate)
+        self.opt = self._minimize(self.cost)
+
+    def _minimize(self, cost, loss_scale=1024.):
+        """Create an op that performs an optimizer step on the cost.
+
+        Under mixed precision, the cost is scaled up before computing the
+        gradients (and the gradients scaled back down), so that small
+        gradients do not underflow in half precision.
+        """
+        if not self.mixed_precision:
+            return self._optimizer.minimize(cost, var_list=self._var_list)
+        grads = tf.gradients(cost * loss_scale, self._var_list)
+        grads = [grad / loss_scale for grad in grads]
+        return self._optimizer.apply_gradients(zip(grads, self._var_list))
+
+    def _create_epoch_op(self):
+        """Define a full training epoch as a single graph op.
+
+        A `tf.while_loop` draws every minibatch of the epoch from the input
+        pipeline and performs a training step on it, accumulating the cost.
+        """
+        def cond(i, total_cost):
+            return tf.less(i, self._n_batches)
+
+        def body(i, total_cost):
+            x = tf.gather(self._train_data, self._iterator.get_next())
+            _, logits_chain = self._autoencoder(x, self._weights)
+            cost = self._loss(x, logits_chain)
+            opt = self._minimize(cost)
+            with tf.control_dependencies([opt]):
+                return (i + 1, total_cost + cost)
+
+        # Training steps must not overlap, so run one iteration at a time.
+        _, self._epoch_cost = tf.while_loop(
+            cond, body, (tf.constant(0, dtype=tf.int64), tf.constant(0.)),
+            parallel_iterations=1)
 
     def transform(self, X):
         """Transform data by mapping it into the latent space.
@@ -429,6 +664,10 @@ class DAE(object):
     def sample(self, in_samples, n_samples):
         """Generate samples via pseudo-Gibbs sampling.
 
+        Each sample is the reconstruction (as by `reconstruct`) of the
+        previous one, so with walkbacks every sample runs the full walkback
+        chain.
+
         Parameters
         ----------
         in_samples : ndarray, shape (n_samples, n_features)
@@ -436,28 +675,49 @@ class DAE(object):
         n_samples : int
             Number of samples to generate.
 
-        Returns samples.
+        Returns samples (as float32).
         """
         if not hasattr(in_samples, "__len__"):
             in_samples = [in_samples]
 
-        samples = np.empty(shape=(n_samples, self.net_arch['n_input']))
-        for i in range(n_samples):
-            if i == 0:
-                # Choose a random sample as the initialization.
-                in_sample = in_samples[
-                    self.random_state.randint(
-                        len(in_samples), size=1)]
-                out_sample = self.sess.run(self.y, feed_dict={
-                    self.x: in_sample
-                })
-            else:
-                out_sample = self.sess.run(self.y, feed_dict={
-                    self.x: samples[i - 1].reshape((1, -1))
-                })
-            samples[i] = out_sample
-
-        return samples
+        # Choose a random sample as the initialization.
+        in_sample = in_samples[
+            self.random_state.randint(
+                len(in_samples), size=1)]
+
+        return self.sample_multi(in_sample, n_samples)
+
+    def sample_multi(self, seeds, steps):
+        """Generate samples via parallel pseudo-Gibbs sampling chains.
+
+        One chain is started from each seed. The chains are run as a single
+        batch, so all `len(seeds) * steps` samples are generated in one call.
+
+        Parameters
+        ----------
+        seeds : ndarray, shape (n_chains, n_features)
+            Matrix containing the initialization of each chain.
+        steps : int
+            Number of samples to generate per chain.
+
+        Returns samples (as float32), with the samples of each chain in
+        consecutive rows.
+        """
+        seeds = np.asarray(seeds).reshape((-1, self.net_arch['n_input']))
+
+        if steps == 0 or len(seeds) == 0:
+            # A zero-size sampling chain cannot be stacked.
+            return np.empty((0, self.net_arch['n_input']), dtype=np.float32)
+
+        # Run all chains in a single call.
+        samples = self.sess.run(self.samples, feed_dict={
+            self.x: seeds,
+            self.n_samples_ph: steps
+        })
+
+        # Reorder from (steps, n_chains, n_features) to chain-major.
+        return samples.transpose((1, 0, 2)).reshape(
+            (-1, self.net_arch['n_input']))
 
     def partial_fit(self, X):
         """Train model based on mini-batch of input data.
@@ -489,27 +749,22 @@ class DAE(object):
             display_step = self.log_every
         n_samples = X.shape[0]
 
+        if shuffle:
+            init_op = self._init_shuffled
+        else:
+            init_op = self._init_ordered
+
+        # Load the training data into the session once.
+        self.sess.run(self._X_var.initializer, feed_dict={self._X_train: X})
+
         for epoch in range(self.num_epochs):
-            if shuffle:
-                indices = np.arange(len(X))
-                self.random_state.shuffle(indices)
-            avg_cost = 0.
-            # Loop over all batches.
-            start_idxs = range(
-                0, len(X) - self.batch_size + 1, self.batch_size)
-            for start_idx in start_idxs:
-                if shuffle:
-                    excerpt = indices[start_idx:start_idx + self.batch_size]
-                else:
-                    excerpt = slice(start_idx, start_idx + self.batch_size)
-                batch = np.array(X[excerpt])
-
-                # Fit training using batch data.
-                cost = self.partial_fit(batch)
-                # Compute average loss.
-                avg_cost += cost / n_samples * self.batch_size
-
-            if len(start_idxs) > 0:
+            self.sess.run(init_op)
+            # Fit training using all batches of the epoch.
+            total_cost = self.sess.run(self._epoch_cost)
+            # Compute average loss.
+            avg_cost = total_cost / n_samples * self.batch_size
+
+            if n_samples >= self.batch_size:
                 # Display logs per epoch step.
                 if display_step and epoch % display_step == 0:
                     print("Epoch: {:d}".format(epoch + 1),
@@ -517,6 +772,38 @@ class DAE(object):
 
         return self
 
+    def freeze(self, path=None):
+        """Freeze the inference graph for deployment.
+
+        Variables are converted to constants, and only the ops needed to
+        compute the latent representation and the reconstruction from the
+        input are kept (the input pipeline, training and sampling ops are
+        stripped). The result can be loaded with `tf.import_graph_def`, or
+        compiled ahead-of-time with `tfcompile`.
+
+        Parameters
+        ----------
+        path : str or None
+            If given, the frozen graph is written (serialized) to this file.
+
+        Returns
+        -------
+        graph_def : GraphDef
+            Frozen graph. Its input and outputs are the nodes named
+            `self.x.op.name`, `self.z.op.name` and `self.y.op.name` (`x`, `z`
+            and `y` for the first DAE in a graph; later ones get a numeric
+            suffix, e.g. `x_1`).
+        """
+        graph_def = tf.graph_util.convert_variables_to_constants(
+            self.sess, self.sess.graph.as_graph_def(),
+            [self.z.op.name, self.y.op.name])
+
+        if path is not None:
+            with open(path, 'wb') as f:
+                f.write(graph_def.SerializeToString())
+
+        return graph_def
+
     def close(self):
         """Closes the TensorFlow session."""
         self.sess.close()
@@ -536,7 +823,8 @@ def main(data, n_samples, args):
                 args.b_init_fct,
                 args.learning_rate,
                 args.random_state,
-                args.log_every)
+                args.log_every,
+                args.mixed_precision)
     model.fit(data)
     samples = model.gen_samples(n_samples)
     model.close()
@@ -567,10 +855,12 @@ def parse_args():
                         help='Number of walkbacks to use.')
     parser.add_argument('--transfer_fct', type=object, default=tf.nn.sigmoid,
                         help='Transfer function for hidden layers.')
-    parser.add_argument('--W_init_fct', type=object, default=init_xavier,
-                        help='Initialization function for weights.')
-    parser.add_argument('--b_init_fct', type=object, default=tf.zeros,
-                        help='Initialization function for biases.')
+    parser.add_argument('--W_init_fct', type=object,
+                        default=tf.glorot_uniform_initializer(),
+                        help='Initializer for weights.')
+    parser.add_argument('--b_init_fct', type=object,
+                        default=tf.zeros_initializer(),
+                        help='Initializer for biases.')
     parser.add_argument('--learning_rate', type=float, default=0.001,
                         help='Learning rate schedule for weight updates.')
     parser.add_argument('--random_state', type=int, default=None,
@@ -578,6 +868,8 @@ def parse_args():
     parser.add_argument('--log_every', type=int, default=None,
                         help='Print loss during training after this many '
                         'steps.')
+    parser.add_argument('--mixed_precision', action='store_true',
+                        help='Compute layer matmuls in half precision.')
     return parser.parse_args()
 
 
@@ -56,10 +56,7 @@ def binary_crossentropy(preds, targets, offset=1e-10, name=None):
 
 def lrelu(X, leak=0.2, name='lrelu'):
     """Leaky rectified linear unit (LReLU)."""
-    with tf.variable_scope(name):
-        f1 = 0.5 * (1 + leak)
-        f2 = 0.5 * (1 - leak)
-        return f1 * X + f2 * abs(X)
+    return tf.nn.leaky_relu(X, alpha=leak, name=name)
 
 
 def linear(input_, output_size, scope=None, stddev=0.5, bias_start=0.0,
@@ -41,16 +41,6 @@ def init_xavier(fan, constant=1):
                              dtype=tf.float32)
 
 
-def binary_crossentropy(output, target, offset=1e-10):
-    """Compute the binary cross-entropy per sample.
-
-    Add offset to avoid evaluation of log(0.0).
-    """
-    output_ = tf.clip_by_value(output, offset, 1 - offset)
-    return -tf.reduce_sum(target * tf.log(output_)
-                          + (1 - target) * tf.log(1 - output_), 1)
-
-
 class VAE(object):
     """Variational Autoencoder (VAE) implemented using TensorFlow.
 
@@ -162,8 +152,9 @@ class VAE(object):
 
         # Use generator to determine mean of Bernoulli distribution of
         # reconstructed input.
-        self.x_reconstr_mean = \
+        self.x_reconstr_logits = \
             self._generator_network(self.z, layer_dim)
+        self.x_reconstr_mean = tf.nn.sigmoid(self.x_reconstr_logits)
 
     def _recognition_network(self, layer_input, layer_dim):
         """Define the recognition network.
@@ -222,8 +213,8 @@ class VAE(object):
 
         Returns
         -------
-        x_reconstr_mean : Tensor
-            Mean of the reconstructed data.
+        x_reconstr_logits : Tensor
+            Logits of the mean of the reconstructed data.
         """
         for layer_i, n_output in enumerate(reversed(layer_dim[1:])):
             n_input = int(layer_input.get_shape()[1])
@@ -240,9 +231,9 @@ class VAE(object):
         b_out_mean = tf.Variable(self.b_init_fct(
             [self.net_arch['n_output']], dtype=tf.float32))
 
-        x_reconstr_mean = tf.nn.sigmoid(tf.add(tf.matmul(
-            layer_input, W_out_mean), b_out_mean))
-        return x_reconstr_mean
+        x_reconstr_logits = tf.add(tf.matmul(layer_input, W_out_mean),
+                                   b_out_mean)
+        return x_reconstr_logits
 
     def _create_loss_optimizer(self):
         """Define the cost function.
@@ -260,7 +251,9 @@ class VAE(object):
             interpreted as the number of "nats" required for transmitting the
             latent space distribution given the prior.
         """
-        reconstr_loss = binary_crossentropy(self.x_reconstr_mean, self.x)
+        reconstr_loss = tf.reduce_sum(
+            tf.nn.sigmoid_cross_entropy_with_logits(
+                labels=self.x, logits=self.x_reconstr_logits), 1)
         latent_loss = -0.5 * tf.reduce_mean(1 + self.z_log_sigma_sq
                                             - tf.square(self.z_mean)
                                             - tf.exp(self.z_log_sigma_sq), 1)